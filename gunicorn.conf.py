@@ -7,36 +7,82 @@ in production environments with proper logging, worker management, and security.
 
 import multiprocessing
 import os
+import resource
+import signal
+import threading
+import time
 
 # Server socket
 bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
-backlog = 2048
+# The kernel clamps backlog to net.core.somaxconn, so raise that sysctl too
+# when going above its default.
+backlog = int(os.getenv('GUNICORN_BACKLOG', '4096'))
+# SO_REUSEPORT (Linux >= 3.9) lets the kernel spread accepts across workers,
+# but each worker then owns its listener: when one exits (max_requests,
+# autoscaling down) the connections queued on it are reset. Only enable it
+# with net.ipv4.tcp_migrate_req=1 (Linux >= 5.14), which moves them to a
+# surviving listener.
+reuse_port = os.getenv('GUNICORN_REUSE_PORT', '').lower() == 'true'
+
+# Every environment-dependent setting is resolved once, here, so explicit
+# GUNICORN_* overrides always win over the development/production defaults.
+_env = os.getenv('WOLFPY_ENV', 'production')
+_development = _env == 'development'
 
 # Worker processes
-workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
-worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
-worker_connections = 1000
-max_requests = 1000
-max_requests_jitter = 50
+# gevent_pywsgi parses requests with gevent's pywsgi server instead of
+# gunicorn's pure-Python HTTP parser
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync' if _development else 'gevent_pywsgi')
+
+# Each gevent worker is an event loop that can saturate a core on its own,
+# so async workers are sized to the core count; sync workers use 2*cores+1.
+_cpu = multiprocessing.cpu_count()
+if _development:
+    _default_workers = 1
+elif worker_class.startswith('gevent'):
+    _default_workers = _cpu
+else:
+    _default_workers = _cpu * 2 + 1
+workers = int(os.getenv('GUNICORN_WORKERS', _default_workers))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', '2000'))
 preload_app = True
-timeout = 30
-keepalive = 2
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120' if _development else '30'))
+# Must be >= the frontend proxy's upstream idle timeout (nginx
+# keepalive_timeout, ALB idle_timeout), otherwise the proxy can reuse a
+# connection gunicorn has just closed and answer with a 502. Sync workers
+# hold a whole worker per open connection, so when_ready/on_reload turn
+# keep-alive off for them (the class may come from -k, not this file).
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
 
 # Restart workers after this many requests, to help prevent memory leaks
-max_requests = 1000
-max_requests_jitter = 100
+# (GUNICORN_MAX_REQUESTS=0 disables recycling, e.g. for load tests)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
 
 # Logging
-accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')  # stdout
+# Access logging is off by default: a blocking write per request stalls the
+# gevent hub when stdout is a slow pipe, and the fronting proxy already logs
+# requests. Set GUNICORN_ACCESS_LOG (e.g. '-') to log locally, or
+# GUNICORN_SYSLOG=true to ship logs over UDP syslog, which drops rather than
+# blocks under overload.
+accesslog = os.getenv('GUNICORN_ACCESS_LOG')
 errorlog = os.getenv('GUNICORN_ERROR_LOG', '-')   # stderr
-loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'debug' if _development else 'info')
 access_log_format = '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s'
 
+if os.getenv('GUNICORN_SYSLOG', '').lower() == 'true':
+    syslog = True
+    syslog_addr = os.getenv('GUNICORN_SYSLOG_ADDR', 'udp://localhost:514')
+    syslog_facility = os.getenv('GUNICORN_SYSLOG_FACILITY', 'local0')
+    access_log_format = '%(h)s "%(r)s" %(s)s %(b)s %(D)s'
+
 # Process naming
 proc_name = 'wolfpy'
 
 # Server mechanics
 daemon = False
+reload = _development
+reload_extra_files = ['templates/', 'static/'] if _development else []
 pidfile = '/tmp/gunicorn.pid'
 user = None
 group = None
@@ -57,17 +103,121 @@ raw_env = [
     f'DEBUG={os.getenv("DEBUG", "False")}',
 ]
 
-# Worker timeout and graceful shutdown
+# Graceful shutdown
 graceful_timeout = 30
-timeout = 30
 
-# Enable stats if requested
+# Enable stats if requested (statsd over UDP, the preferred metrics path)
 if os.getenv('GUNICORN_STATS', '').lower() == 'true':
     statsd_host = os.getenv('STATSD_HOST', 'localhost:8125')
+    statsd_prefix = os.getenv('STATSD_PREFIX', 'wolfpy')
+
+# Adaptive worker count (opt-in). The master samples the listen queue and
+# grows or shrinks the pool with TTIN/TTOU between the configured bounds.
+# The floor defaults to the effective worker count, so autoscaling only
+# adds workers under load: gevent workers rarely leave a backlog, and a
+# lower floor would shrink the pool below its sizing on an idle queue.
+_autoscale = os.getenv('GUNICORN_AUTOSCALE', '').lower() == 'true'
+_autoscale_min = int(os.getenv('GUNICORN_AUTOSCALE_MIN', '0'))  # 0: cfg.workers
+_autoscale_max = int(os.getenv('GUNICORN_AUTOSCALE_MAX', min(128, 4 * _cpu)))
+_autoscale_interval = float(os.getenv('GUNICORN_AUTOSCALE_INTERVAL', '5'))
+_autoscale_samples = 3
+_autoscale_high = 0.7
+_autoscale_low = 0.3
+
+
+_TCP_LISTEN = '0A'
+_TCP_CLOSE_WAIT = '08'
+
+
+def _proc_tcp_rows():
+    """Yield the split rows of the kernel's IPv4 and IPv6 TCP socket tables."""
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table) as f:
+                next(f)  # header
+                rows = [line.split() for line in f]
+        except OSError:
+            continue
+        yield from rows
+
+
+def _listen_queue_depth(ports):
+    """Return the number of connections waiting to be accepted on ports."""
+    depth = 0
+    for fields in _proc_tcp_rows():
+        if fields[3] == _TCP_LISTEN and int(fields[1].rsplit(':', 1)[1], 16) in ports:
+            # For listening sockets rx_queue holds the accept queue length;
+            # with reuse_port every worker has its own listening socket.
+            depth += int(fields[4].split(':')[1], 16)
+    return depth
+
+
+def _autoscale_bounds(cfg):
+    """Return the (min, max) worker counts the autoscaler keeps to."""
+    low = _autoscale_min or cfg.workers
+    return low, max(low, _autoscale_max)
+
+
+def _autoscale_loop(server):
+    """Adjust the worker count based on sustained listen queue pressure."""
+    ports = {addr[1] for addr in server.cfg.address if isinstance(addr, tuple)}
+    if not ports or not os.path.exists('/proc/net/tcp'):
+        server.log.info("Autoscaling disabled: listen queue depth unavailable")
+        return
+
+    low, high = _autoscale_bounds(server.cfg)
+    busy = idle = 0
+    while True:
+        time.sleep(_autoscale_interval)
+        pressure = _listen_queue_depth(ports) / max(server.num_workers, 1)
+        busy = busy + 1 if pressure > _autoscale_high else 0
+        idle = idle + 1 if pressure < _autoscale_low else 0
+
+        if busy >= _autoscale_samples and server.num_workers < high:
+            server.log.info("Autoscaling up (pressure %.2f)", pressure)
+            os.kill(server.pid, signal.SIGTTIN)
+            busy = 0
+        elif idle >= _autoscale_samples and server.num_workers > low:
+            server.log.info("Autoscaling down (pressure %.2f)", pressure)
+            os.kill(server.pid, signal.SIGTTOU)
+            idle = 0
+
+
+def _is_gevent(cfg):
+    """Whether the worker class gunicorn actually runs is a gevent one."""
+    return 'gevent' in cfg.worker_class_str.lower()
+
+
+def _apply_worker_class_settings(server):
+    """Adjust settings that depend on the effective worker class."""
+    cfg = server.cfg
+    if cfg.worker_class_str == 'sync' or cfg.worker_class_str.endswith('SyncWorker'):
+        cfg.set('keepalive', 0)
+
+
+def on_reload(server):
+    """Called when the configuration is reloaded, before new workers spawn."""
+    _apply_worker_class_settings(server)
+
 
 def when_ready(server):
     """Called just after the server is started."""
     server.log.info("WolfPy server is ready. Listening on %s", server.address)
+    _apply_worker_class_settings(server)
+    cfg = server.cfg
+    server.log.info(
+        "Effective settings: worker_class=%s workers=%s worker_connections=%s "
+        "timeout=%s keepalive=%s max_requests=%s max_requests_jitter=%s backlog=%s",
+        cfg.worker_class_str, cfg.workers, cfg.worker_connections, cfg.timeout,
+        cfg.keepalive, cfg.max_requests, cfg.max_requests_jitter, cfg.backlog,
+    )
+
+    if _autoscale:
+        threading.Thread(
+            target=_autoscale_loop, args=(server,), name='wolfpy-autoscale', daemon=True
+        ).start()
+        server.log.info("Autoscaling workers between %s and %s",
+                        *_autoscale_bounds(server.cfg))
 
 def worker_int(worker):
     """Called just after a worker exited on SIGINT or SIGQUIT."""
@@ -81,24 +231,109 @@ def post_fork(server, worker):
     """Called just after a worker has been forked."""
     server.log.info("Worker spawned (pid: %s)", worker.pid)
 
+    # gevent workers need the stdlib patched before any socket/ssl use. The
+    # worker patches in init_process, right after this hook; doing it here
+    # already covers anything imported by the hooks in between.
+    if _is_gevent(worker.cfg):
+        from gevent import monkey
+        monkey.patch_all()
+
+# Sockets the app leaves in CLOSE_WAIT longer than this are shut down by a
+# per-worker reaper on gevent workers (0 disables the reaper).
+_socket_reap_timeout = float(os.getenv('SOCKET_REAP_TIMEOUT', '60'))
+_socket_reap_interval = 5
+
+
+def _close_wait_inodes():
+    """Return the inodes of TCP sockets currently in CLOSE_WAIT."""
+    return {fields[9] for fields in _proc_tcp_rows() if fields[3] == _TCP_CLOSE_WAIT}
+
+
+def _socket_fds():
+    """Map socket inodes to the file descriptors this process holds."""
+    fds = {}
+    for fd in os.listdir('/proc/self/fd'):
+        try:
+            target = os.readlink(f'/proc/self/fd/{fd}')
+        except OSError:
+            continue
+        if target.startswith('socket:['):
+            fds[target[8:-1]] = int(fd)
+    return fds
+
+
+def _stuck_socket_fds():
+    """Map the inodes of this process's CLOSE_WAIT sockets to their fds."""
+    stuck = _close_wait_inodes()
+    return {inode: fd for inode, fd in _socket_fds().items() if inode in stuck}
+
+
+def _socket_reaper(worker):
+    """Shut down sockets that have been stuck in CLOSE_WAIT past the timeout."""
+    import _socket
+    import gevent
+
+    threadpool = gevent.get_hub().threadpool
+    first_seen = {}
+    while worker.alive:
+        # Reading /proc blocks, so keep it off the hub
+        stuck = threadpool.apply(_stuck_socket_fds)
+        now = time.monotonic()
+        first_seen = {inode: first_seen.get(inode, now) for inode in stuck}
+        for inode, since in list(first_seen.items()):
+            if now - since > _socket_reap_timeout:
+                # The fd belongs to a live socket object (the app's HTTP or DB
+                # pool, say), so closing it would let the number be reused
+                # under its owner. Shutting it down instead makes the owner see
+                # EOF and close it itself.
+                fd = stuck[inode]
+                del first_seen[inode]
+                try:
+                    # The owner may have closed the fd while the scan ran, or
+                    # the number may now belong to another socket; nothing
+                    # yields between this check and the shutdown.
+                    if os.fstat(fd).st_ino != int(inode):
+                        continue
+                    sock = _socket.socket(fileno=fd)
+                    try:
+                        sock.shutdown(_socket.SHUT_RDWR)
+                    finally:
+                        sock.detach()
+                except OSError:
+                    continue
+                worker.log.warning("Shut down CLOSE_WAIT socket (fd %s, pid %s)",
+                                   fd, worker.pid)
+        gevent.sleep(_socket_reap_interval)
+
+
 def post_worker_init(worker):
     """Called just after a worker has initialized the application."""
     worker.log.info("Worker initialized (pid: %s)", worker.pid)
 
+    if _is_gevent(worker.cfg):
+        from gevent import monkey
+        if not monkey.is_module_patched('socket'):
+            worker.log.error("gevent worker running without monkey patching (pid: %s)",
+                             worker.pid)
+
+    # Leave room for worker_connections client sockets plus upstream calls
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = 4 * worker.cfg.worker_connections
+    if hard != resource.RLIM_INFINITY:
+        wanted = min(wanted, hard)
+    if wanted > soft:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+        except (ValueError, OSError) as e:
+            worker.log.warning("Could not raise open file limit to %s: %s", wanted, e)
+
+    # Runs here rather than in post_fork so the greenlet lives on the hub the
+    # gevent worker reinitializes after monkey patching
+    if _is_gevent(worker.cfg) and _socket_reap_timeout > 0:
+        import gevent
+        gevent.spawn_later(_socket_reap_interval, _socket_reaper, worker)
+
 def worker_abort(worker):
     """Called when a worker received the SIGABRT signal."""
     worker.log.info("Worker received SIGABRT signal")
 
-# Development vs Production settings
-if os.getenv('WOLFPY_ENV') == 'development':
-    # Development settings
-    workers = 1
-    reload = True
-    reload_extra_files = ['templates/', 'static/']
-    loglevel = 'debug'
-    timeout = 120
-else:
-    # Production settings
-    preload_app = True
-    worker_class = 'gevent'  # Use gevent for better concurrency
-    worker_connections = 1000
@@ -5,23 +5,16 @@ This is a demonstration plugin that shows how to create and integrate
 plugins with the WolfPy framework.
 """
 
+import gzip
+import hashlib
+import json
+from time import time as _now
+
 from wolfpy.core.response import Response
 
 
-def setup(app):
-    """
-    Setup the example plugin with the WolfPy app.
-    
-    Args:
-        app: WolfPy application instance
-    """
-    print("🔌 Loading Example Plugin...")
-    
-    # Register plugin routes
-    @app.route('/example')
-    def example_home(request):
-        """Example plugin home page."""
-        return Response("""
+# Static pages are encoded and hashed once at import instead of per request.
+_HOME_HTML = """
         <html>
         <head>
             <title>Example Plugin</title>
@@ -70,56 +63,9 @@ def setup(app):<br>
             <p><a href="/">← Back to Home</a> | <a href="/docs/plugins">📚 Plugin Documentation</a></p>
         </body>
         </html>
-        """)
-    
-    @app.route('/example/api/info')
-    def example_api_info(request):
-        """Plugin API information endpoint."""
-        return Response.json({
-            'plugin': 'example',
-            'version': '1.0.0',
-            'status': 'active',
-            'description': 'Example plugin for WolfPy framework',
-            'endpoints': [
-                '/example',
-                '/example/api/info',
-                '/example/api/data',
-                '/example/demo'
-            ],
-            'features': [
-                'custom_routes',
-                'api_endpoints',
-                'json_responses',
-                'html_templates'
-            ]
-        })
-    
-    @app.route('/example/api/data')
-    def example_api_data(request):
-        """Sample data API endpoint."""
-        # Simulate some data processing
-        sample_data = [
-            {'id': 1, 'name': 'Item 1', 'value': 100},
-            {'id': 2, 'name': 'Item 2', 'value': 200},
-            {'id': 3, 'name': 'Item 3', 'value': 300},
-        ]
-        
-        # Support filtering
-        filter_name = request.args.get('filter')
-        if filter_name:
-            sample_data = [item for item in sample_data if filter_name.lower() in item['name'].lower()]
-        
-        return Response.json({
-            'data': sample_data,
-            'count': len(sample_data),
-            'plugin': 'example',
-            'timestamp': __import__('time').time()
-        })
-    
-    @app.route('/example/demo')
-    def example_demo(request):
-        """Interactive demo page."""
-        return Response("""
+        """
+
+_DEMO_HTML = """
         <html>
         <head>
             <title>Example Plugin Demo</title>
@@ -181,7 +127,119 @@ def setup(app):<br>
             </script>
         </body>
         </html>
-        """)
+        """
+
+_HOME_BODY = _HOME_HTML.encode('utf-8')
+_DEMO_BODY = _DEMO_HTML.encode('utf-8')
+_HOME_ETAG = hashlib.blake2b(_HOME_BODY, digest_size=8).hexdigest()
+_DEMO_ETAG = hashlib.blake2b(_DEMO_BODY, digest_size=8).hexdigest()
+# mtime=0 keeps the gzip output deterministic across processes
+_HOME_GZ = gzip.compress(_HOME_BODY, compresslevel=9, mtime=0)
+_DEMO_GZ = gzip.compress(_DEMO_BODY, compresslevel=9, mtime=0)
+
+# Sample rows for /example/api/data as (id, name, value), with each row's
+# JSON and lowercased name prepared up front for the filter scan.
+_SAMPLE = [
+    (1, 'Item 1', 100),
+    (2, 'Item 2', 200),
+    (3, 'Item 3', 300),
+]
+_SAMPLE_NAMES_LC = [name.lower().encode('utf-8') for _, name, _ in _SAMPLE]
+_SAMPLE_JSON = [
+    json.dumps({'id': id_, 'name': name, 'value': value}, separators=(',', ':')).encode('utf-8')
+    for id_, name, value in _SAMPLE
+]
+
+_ALL_SAMPLE_JSON = b','.join(_SAMPLE_JSON)
+
+_JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+_DATA_PREFIX = b'{"data":['
+_DATA_SUFFIX_TMPL = b'],"count":%d,"plugin":"example","timestamp":%.6f}'
+
+
+def _data_body(items, count, timestamp):
+    """Assemble the /example/api/data payload around pre-serialized rows."""
+    return _DATA_PREFIX + items + _DATA_SUFFIX_TMPL % (count, timestamp)
+
+
+def _html_response(request, body, gz_body, etag):
+    """Serve a precomputed HTML page, gzipped when the client accepts it."""
+    # The gzip variant is a different byte sequence, so it gets its own
+    # strong validator
+    gzipped = 'gzip' in request.get_header('Accept-Encoding', '')
+    if gzipped:
+        etag = f'{etag}-gz'
+    headers = {'ETag': f'"{etag}"', 'Vary': 'Accept-Encoding'}
+    if_none_match = request.get_header('If-None-Match')
+    # If-None-Match uses weak comparison, so W/ validators match too
+    if if_none_match and (if_none_match.strip() == '*' or etag in (
+            tag.strip().removeprefix('W/').strip('"') for tag in if_none_match.split(','))):
+        return Response('', status=304, headers=headers)
+    if gzipped:
+        headers['Content-Encoding'] = 'gzip'
+        body = gz_body
+    return Response(body, content_type='text/html; charset=utf-8', headers=headers)
+
+
+def setup(app):
+    """
+    Setup the example plugin with the WolfPy app.
+    
+    Args:
+        app: WolfPy application instance
+    """
+    print("🔌 Loading Example Plugin...")
+    
+    # Register plugin routes
+    @app.route('/example')
+    def example_home(request):
+        """Example plugin home page."""
+        return _html_response(request, _HOME_BODY, _HOME_GZ, _HOME_ETAG)
+    
+    # The info payload never changes, so serialize it once per app
+    info_json = json.dumps({
+        'plugin': 'example',
+        'version': '1.0.0',
+        'status': 'active',
+        'description': 'Example plugin for WolfPy framework',
+        'endpoints': [
+            '/example',
+            '/example/api/info',
+            '/example/api/data',
+            '/example/demo'
+        ],
+        'features': [
+            'custom_routes',
+            'api_endpoints',
+            'json_responses',
+            'html_templates'
+        ]
+    }, separators=(',', ':')).encode('utf-8')
+
+    @app.route('/example/api/info')
+    def example_api_info(request):
+        """Plugin API information endpoint."""
+        return Response(info_json, content_type=_JSON_CONTENT_TYPE,
+                        cache_control='public, max-age=300')
+    
+    @app.route('/example/api/data')
+    def example_api_data(request):
+        """Sample data API endpoint."""
+        # Support filtering
+        filter_name = request.get_arg('filter')
+        if filter_name:
+            needle = filter_name.lower().encode('utf-8')
+            indices = [i for i, name in enumerate(_SAMPLE_NAMES_LC) if name.find(needle) != -1]
+            body = _data_body(b','.join([_SAMPLE_JSON[i] for i in indices]), len(indices), _now())
+        else:
+            body = _data_body(_ALL_SAMPLE_JSON, len(_SAMPLE), _now())
+        
+        return Response(body, content_type=_JSON_CONTENT_TYPE)
+    
+    @app.route('/example/demo')
+    def example_demo(request):
+        """Interactive demo page."""
+        return _html_response(request, _DEMO_BODY, _DEMO_GZ, _DEMO_ETAG)
     
     # Register plugin hooks (if needed)
     if hasattr(app, 'plugin_manager') and app.plugin_manager:
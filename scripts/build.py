@@ -18,9 +18,24 @@ import subprocess
 import sys
 import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from importlib.util import find_spec
 from pathlib import Path
 from typing import List, Optional
 
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+
+# Directories never descended into when cleaning __pycache__
+CLEAN_SKIP_DIRS = {".git", "venv", ".venv", "node_modules", "dist", "build", ".tox"}
+
 
 class WolfPyBuilder:
     """WolfPy package builder and publisher."""
@@ -46,40 +61,50 @@ class WolfPyBuilder:
                 shutil.rmtree(egg_info)
                 print(f"   Removed {egg_info}")
         
-        # Remove __pycache__ directories
-        for pycache in self.project_root.rglob("__pycache__"):
-            if pycache.is_dir():
-                shutil.rmtree(pycache)
+        # Collect __pycache__ directories, pruning trees that never hold ours
+        pycache_dirs = []
+        for dir_path, dir_names, _ in os.walk(self.project_root, topdown=True):
+            dir_names[:] = [d for d in dir_names if d not in CLEAN_SKIP_DIRS]
+            if "__pycache__" in dir_names:
+                pycache_dirs.append(os.path.join(dir_path, "__pycache__"))
+                dir_names.remove("__pycache__")
+        
+        # Removal is unlink-bound and releases the GIL, so run it in parallel
+        if pycache_dirs:
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(pycache_dirs))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(shutil.rmtree, pycache_dirs))
         
         print("✅ Clean completed")
+        return True
     
-    def check_dependencies(self):
+    def check_dependencies(self, report=print):
         """Check if required build dependencies are installed."""
-        print("🔍 Checking build dependencies...")
+        report("🔍 Checking build dependencies...")
         
         required_packages = ["build", "twine", "wheel"]
         missing_packages = []
         
+        # find_spec locates the package without executing its import-time code
         for package in required_packages:
-            try:
-                __import__(package)
-                print(f"   ✅ {package}")
-            except ImportError:
+            if find_spec(package) is None:
                 missing_packages.append(package)
-                print(f"   ❌ {package}")
+                report(f"   ❌ {package}")
+            else:
+                report(f"   ✅ {package}")
         
         if missing_packages:
-            print(f"\n❌ Missing required packages: {', '.join(missing_packages)}")
-            print("Install them with:")
-            print(f"   pip install {' '.join(missing_packages)}")
+            report(f"\n❌ Missing required packages: {', '.join(missing_packages)}")
+            report("Install them with:")
+            report(f"   pip install {' '.join(missing_packages)}")
             return False
         
-        print("✅ All dependencies available")
+        report("✅ All dependencies available")
         return True
     
-    def validate_project(self):
+    def validate_project(self, report=print):
         """Validate project structure and configuration."""
-        print("🔍 Validating project structure...")
+        report("🔍 Validating project structure...")
         
         required_files = [
             "pyproject.toml",
@@ -93,30 +118,28 @@ class WolfPyBuilder:
             full_path = self.project_root / file_path
             if not full_path.exists():
                 missing_files.append(file_path)
-                print(f"   ❌ {file_path}")
+                report(f"   ❌ {file_path}")
             else:
-                print(f"   ✅ {file_path}")
+                report(f"   ✅ {file_path}")
         
         if missing_files:
-            print(f"\n❌ Missing required files: {', '.join(missing_files)}")
+            report(f"\n❌ Missing required files: {', '.join(missing_files)}")
             return False
         
         # Check if version is set
+        if tomllib is None:
+            report("   ❌ Could not read version: install tomli on Python < 3.11")
+            return False
+        
         try:
-            result = subprocess.run(
-                [sys.executable, "-c", "import tomllib; print(tomllib.load(open('pyproject.toml', 'rb'))['project']['version'])"],
-                cwd=self.project_root,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            version = result.stdout.strip()
-            print(f"   ✅ Version: {version}")
+            with open(self.project_root / "pyproject.toml", "rb") as f:
+                version = tomllib.load(f)["project"]["version"]
+            report(f"   ✅ Version: {version}")
         except Exception as e:
-            print(f"   ❌ Could not read version: {e}")
+            report(f"   ❌ Could not read version: {e}")
             return False
         
-        print("✅ Project validation passed")
+        report("✅ Project validation passed")
         return True
     
     def run_tests(self):
@@ -138,68 +161,71 @@ class WolfPyBuilder:
             print("⚠️  pytest not found, skipping tests")
             return True
     
+    @staticmethod
+    def _run_in_process(module_name: str, entry_point: str, args: List[str]) -> bool:
+        """
+        Run a command line entry point in this interpreter.
+        
+        build and twine report failure through SystemExit or a truthy
+        return value, so both are mapped back to a boolean here.
+        """
+        try:
+            result = getattr(import_module(module_name), entry_point)(args)
+        except SystemExit as e:
+            return not e.code
+        except Exception as e:
+            print(f"   {e}")
+            return False
+        return not result
+    
+    def _twine(self, *args: str) -> bool:
+        """Run a twine command against the built distributions."""
+        return self._run_in_process(
+            "twine.cli", "dispatch", [*args, str(self.dist_dir / "*")]
+        )
+    
     def build_package(self):
         """Build the package."""
         print("📦 Building package...")
         
-        try:
-            # Build source distribution and wheel
-            subprocess.run(
-                [sys.executable, "-m", "build"],
-                cwd=self.project_root,
-                check=True
-            )
-            
-            # List built files
-            if self.dist_dir.exists():
-                built_files = list(self.dist_dir.glob("*"))
-                print("✅ Package built successfully:")
-                for file_path in built_files:
-                    size = file_path.stat().st_size
-                    print(f"   📄 {file_path.name} ({size:,} bytes)")
-            
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Build failed: {e}")
+        # Build source distribution and wheel
+        if not self._run_in_process("build.__main__", "main", [str(self.project_root)]):
+            print("❌ Build failed")
             return False
+        
+        # List built files
+        if self.dist_dir.exists():
+            print("✅ Package built successfully:")
+            # scandir entries carry their stat data from the directory read
+            with os.scandir(self.dist_dir) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        print(f"   📄 {entry.name} ({entry.stat().st_size:,} bytes)")
+        
+        return True
     
     def check_package(self):
         """Check the built package with twine."""
         print("🔍 Checking package...")
         
-        try:
-            subprocess.run(
-                [sys.executable, "-m", "twine", "check", "dist/*"],
-                cwd=self.project_root,
-                check=True
-            )
-            print("✅ Package check passed")
-            return True
-        except subprocess.CalledProcessError:
+        if not self._twine("check"):
             print("❌ Package check failed")
             return False
+        
+        print("✅ Package check passed")
+        return True
     
     def publish_to_testpypi(self):
         """Publish package to TestPyPI."""
         print("🚀 Publishing to TestPyPI...")
         
-        try:
-            subprocess.run(
-                [
-                    sys.executable, "-m", "twine", "upload",
-                    "--repository", "testpypi",
-                    "dist/*"
-                ],
-                cwd=self.project_root,
-                check=True
-            )
-            print("✅ Published to TestPyPI successfully")
-            print("🔗 Check your package at: https://test.pypi.org/project/wolfpy/")
-            return True
-        except subprocess.CalledProcessError:
+        if not self._twine("upload", "--repository", "testpypi"):
             print("❌ TestPyPI upload failed")
             return False
+        
+        print("✅ Published to TestPyPI successfully")
+        print("🔗 Check your package at: https://test.pypi.org/project/wolfpy/")
+        return True
     
     def publish_to_pypi(self):
         """Publish package to PyPI."""
@@ -211,43 +237,57 @@ class WolfPyBuilder:
             print("❌ Publication cancelled")
             return False
         
-        try:
-            subprocess.run(
-                [sys.executable, "-m", "twine", "upload", "dist/*"],
-                cwd=self.project_root,
-                check=True
-            )
-            print("✅ Published to PyPI successfully")
-            print("🔗 Check your package at: https://pypi.org/project/wolfpy/")
-            return True
-        except subprocess.CalledProcessError:
+        if not self._twine("upload"):
             print("❌ PyPI upload failed")
             return False
+        
+        print("✅ Published to PyPI successfully")
+        print("🔗 Check your package at: https://pypi.org/project/wolfpy/")
+        return True
     
     def build_workflow(self, run_tests: bool = True):
         """Complete build workflow."""
         print("🐺 Starting WolfPy build workflow...")
         print("=" * 50)
         
-        steps = [
-            ("Clean", self.clean),
-            ("Check dependencies", self.check_dependencies),
-            ("Validate project", self.validate_project),
+        stages = [
+            [("Clean", self.clean)],
+            # Metadata checks are independent reads, so run them together
+            # (steps in a shared stage take a report callable for output)
+            [
+                ("Check dependencies", self.check_dependencies),
+                ("Validate project", self.validate_project),
+            ],
         ]
         
         if run_tests:
-            steps.append(("Run tests", self.run_tests))
+            stages.append([("Run tests", self.run_tests)])
         
-        steps.extend([
-            ("Build package", self.build_package),
-            ("Check package", self.check_package),
+        stages.extend([
+            [("Build package", self.build_package)],
+            [("Check package", self.check_package)],
         ])
         
-        for step_name, step_func in steps:
-            print(f"\n📋 {step_name}...")
-            if not step_func():
-                print(f"\n❌ Build failed at step: {step_name}")
-                return False
+        for stage in stages:
+            print(f"\n📋 {' + '.join(step_name for step_name, _ in stage)}...")
+            if len(stage) == 1:
+                results = [stage[0][1]()]
+            else:
+                # Each step reports into its own list, printed in step order
+                # once the pool is done, so concurrent output doesn't mix
+                reports = [[] for _ in stage]
+                with ThreadPoolExecutor(max_workers=len(stage)) as executor:
+                    results = list(executor.map(
+                        lambda step, lines: step[1](report=lines.append), stage, reports
+                    ))
+                for lines in reports:
+                    for line in lines:
+                        print(line)
+            
+            for (step_name, _), passed in zip(stage, results):
+                if not passed:
+                    print(f"\n❌ Build failed at step: {step_name}")
+                    return False
         
         print("\n🎉 Build completed successfully!")
         return True
@@ -316,4 +356,8 @@ def main():
 
 
 if __name__ == "__main__":
+    # Running as a script puts scripts/ on sys.path, where this file would
+    # shadow the pypa "build" package
+    script_dir = Path(__file__).resolve().parent
+    sys.path[:] = [p for p in sys.path if Path(p or ".").resolve() != script_dir]
     sys.exit(main())
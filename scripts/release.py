@@ -15,38 +15,149 @@ import sys
 import subprocess
 import re
 import json
+import hashlib
+import importlib.metadata
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Iterable, Optional
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 try:
     import requests
-    import toml
 except ImportError:
-    print("Missing dependencies. Install with: pip install requests toml")
+    print("Missing dependencies. Install with: pip install requests")
     sys.exit(1)
 
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    try:
+        import tomli as tomllib
+    except ImportError:
+        print("Missing dependencies. Install with: pip install tomli")
+        sys.exit(1)
+
+# Optional: lets create_git_tag commit and tag in-process instead of
+# spawning a git subprocess per step
+try:
+    import pygit2
+except ImportError:
+    pygit2 = None
+
+# Top-level ``version = "..."`` line of pyproject.toml (not e.g. mypy's
+# python_version)
+_VERSION_RE = re.compile(rb'^version = "([^"]*)"', re.MULTILINE)
+
+# Inputs whose contents decide whether a green test/lint run can be reused,
+# and the tools whose versions do (missing config files are skipped)
+_CHECK_INPUTS = (
+    "src/wolfpy", "tests", "pyproject.toml",
+    "pytest.ini", "setup.cfg", "tox.ini", ".flake8",
+)
+_CHECK_TOOLS = ("pytest", "flake8", "black")
+
+# Wall-clock limit for the test suite, and how much of its output to echo
+# when it fails (the full log goes to .release-cache/pytest.log)
+_TEST_TIMEOUT = 1800
+_TEST_TAIL_LINES = 200
+
 
 class ReleaseManager:
     """Manages the release process for WolfPy."""
     
-    def __init__(self, project_root: Path):
+    def __init__(self, project_root: Path, force: bool = False):
         self.project_root = project_root
         self.pyproject_path = project_root / "pyproject.toml"
         self.changelog_path = project_root / "CHANGELOG.md"
+        self.cache_dir = project_root / ".release-cache"
+        self.force = force
+        self._checks_digest: Optional[str] = None
+        
+    def _tree_hash(self, paths: Iterable[str]) -> str:
+        """Hash the relative paths and contents of files under paths."""
+        digest = hashlib.blake2b(digest_size=16)
+        
+        def add_file(path: str, size: int):
+            rel_path = os.path.relpath(path, self.project_root)
+            digest.update(f"{rel_path}\0{size}\0".encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
         
+        def add_tree(directory: str):
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name != "__pycache__":
+                        add_tree(entry.path)
+                elif entry.is_file():
+                    add_file(entry.path, entry.stat().st_size)
+        
+        for path in paths:
+            full_path = self.project_root / path
+            if full_path.is_dir():
+                add_tree(str(full_path))
+            elif full_path.is_file():
+                add_file(str(full_path), full_path.stat().st_size)
+        
+        return digest.hexdigest()
+    
+    def _checks_hash(self) -> str:
+        """
+        Hash the check inputs together with the Python and tool versions.
+        
+        Computed once per release: tests and linting run back to back before
+        anything in the tree is modified.
+        """
+        if self._checks_digest is not None:
+            return self._checks_digest
+        
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self._tree_hash(_CHECK_INPUTS).encode())
+        digest.update(sys.version.encode())
+        for tool in _CHECK_TOOLS:
+            try:
+                version = importlib.metadata.version(tool)
+            except importlib.metadata.PackageNotFoundError:
+                version = ""
+            digest.update(f"\0{tool}\0{version}".encode())
+        self._checks_digest = digest.hexdigest()
+        return self._checks_digest
+    
+    def _is_green(self, stage: str, tree_hash: str) -> bool:
+        """Check whether stage already passed for this tree hash."""
+        if self.force:
+            return False
+        try:
+            return (self.cache_dir / f"{stage}.hash").read_text() == tree_hash
+        except OSError:
+            return False
+    
+    def _mark_green(self, stage: str, tree_hash: str):
+        """Record that stage passed for this tree hash."""
+        self.cache_dir.mkdir(exist_ok=True)
+        (self.cache_dir / f"{stage}.hash").write_text(tree_hash)
+    
     def get_current_version(self) -> str:
         """Get the current version from pyproject.toml."""
-        with open(self.pyproject_path, 'r') as f:
-            data = toml.load(f)
+        with open(self.pyproject_path, 'rb') as f:
+            data = tomllib.load(f)
         return data['project']['version']
     
     def bump_version(self, version_type: str) -> str:
         """Bump version based on type (major, minor, patch)."""
-        current = self.get_current_version()
+        content = self.pyproject_path.read_bytes()
+        match = _VERSION_RE.search(content)
+        if match is None:
+            raise ValueError(f"No project version found in {self.pyproject_path}")
+        
+        current = match.group(1).decode()
         major, minor, patch = map(int, current.split('.'))
         
         if version_type == 'major':
@@ -63,18 +174,11 @@ class ReleaseManager:
         
         new_version = f"{major}.{minor}.{patch}"
         
-        # Update pyproject.toml
-        with open(self.pyproject_path, 'r') as f:
-            content = f.read()
-        
-        content = re.sub(
-            r'version = "[^"]*"',
-            f'version = "{new_version}"',
-            content
-        )
-        
-        with open(self.pyproject_path, 'w') as f:
-            f.write(content)
+        # Update pyproject.toml atomically
+        content = content[:match.start(1)] + new_version.encode() + content[match.end(1):]
+        tmp_path = self.pyproject_path.with_name(self.pyproject_path.name + '.tmp')
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, self.pyproject_path)
         
         print(f"✅ Version bumped from {current} to {new_version}")
         return new_version
@@ -93,60 +197,106 @@ class ReleaseManager:
 
 """
         
-        # Insert after the first line (title)
-        lines = content.split('\n')
-        lines.insert(2, new_entry)
+        # Insert after the title and the blank line below it
+        first_newline = content.find('\n')
+        offset = content.find('\n', first_newline + 1) + 1 if first_newline != -1 else 0
+        if offset:
+            content = content[:offset] + new_entry + '\n' + content[offset:]
+        else:
+            content = content + '\n' + new_entry
         
         with open(self.changelog_path, 'w') as f:
-            f.write('\n'.join(lines))
+            f.write(content)
         
         print(f"✅ Updated CHANGELOG.md for version {version}")
     
     def run_tests(self) -> bool:
         """Run the test suite."""
         print("🧪 Running tests...")
-        result = subprocess.run(
+        tree_hash = self._checks_hash()
+        if self._is_green("tests", tree_hash):
+            print("✅ Tests passed previously for this source tree, skipping")
+            return True
+        
+        # Stream pytest output to a log file instead of buffering it all, and
+        # keep only the tail in memory for the failure report
+        self.cache_dir.mkdir(exist_ok=True)
+        log_path = self.cache_dir / "pytest.log"
+        tail = deque(maxlen=_TEST_TAIL_LINES)
+        proc = subprocess.Popen(
             ["python", "-m", "pytest", "tests/", "-v"],
             cwd=self.project_root,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
             text=True
         )
+        # A hung test never closes stdout, so the timeout has to kill the
+        # process from outside the read loop
+        watchdog = threading.Timer(_TEST_TIMEOUT, proc.kill)
+        watchdog.start()
+        try:
+            with open(log_path, 'w') as log:
+                for line in proc.stdout:
+                    log.write(line)
+                    tail.append(line)
+            returncode = proc.wait()
+        finally:
+            timed_out = not watchdog.is_alive()
+            watchdog.cancel()
+            # Don't leave pytest running if reading its output failed or
+            # was interrupted
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+            proc.stdout.close()
         
-        if result.returncode == 0:
+        if returncode == 0:
+            self._mark_green("tests", tree_hash)
             print("✅ All tests passed")
             return True
         else:
-            print("❌ Tests failed:")
-            print(result.stdout)
-            print(result.stderr)
+            if timed_out:
+                print(f"❌ Tests timed out after {_TEST_TIMEOUT} seconds:")
+            else:
+                print("❌ Tests failed:")
+            print(''.join(tail).rstrip('\n'))
+            print(f"Full output: {log_path}")
             return False
     
     def run_linting(self) -> bool:
         """Run linting checks."""
         print("🔍 Running linting checks...")
+        tree_hash = self._checks_hash()
+        if self._is_green("lint", tree_hash):
+            print("✅ Linting passed previously for this source tree, skipping")
+            return True
         
-        # Run flake8
-        result = subprocess.run(
-            ["flake8", "src/wolfpy", "tests"],
-            cwd=self.project_root,
-            capture_output=True
-        )
+        # flake8 and black are independent, so run them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            flake8 = executor.submit(
+                subprocess.run,
+                ["flake8", "src/wolfpy", "tests"],
+                cwd=self.project_root,
+                capture_output=True
+            )
+            black = executor.submit(
+                subprocess.run,
+                ["black", "--check", "src/wolfpy", "tests"],
+                cwd=self.project_root,
+                capture_output=True
+            )
+            flake8_result, black_result = flake8.result(), black.result()
         
-        if result.returncode != 0:
+        if flake8_result.returncode != 0:
             print("❌ Linting failed")
             return False
         
-        # Run black check
-        result = subprocess.run(
-            ["black", "--check", "src/wolfpy", "tests"],
-            cwd=self.project_root,
-            capture_output=True
-        )
-        
-        if result.returncode != 0:
+        if black_result.returncode != 0:
             print("❌ Code formatting check failed")
             return False
         
+        self._mark_green("lint", tree_hash)
         print("✅ Linting passed")
         return True
     
@@ -155,7 +305,8 @@ class ReleaseManager:
         print("📦 Building package...")
         
         # Clean previous builds
-        subprocess.run(["rm", "-rf", "dist/", "build/"], cwd=self.project_root)
+        shutil.rmtree(self.project_root / "dist", ignore_errors=True)
+        shutil.rmtree(self.project_root / "build", ignore_errors=True)
         
         # Build package
         result = subprocess.run(
@@ -193,30 +344,99 @@ class ReleaseManager:
             print(f"❌ Failed to publish to {'Test ' if test else ''}PyPI")
             return False
     
+    @staticmethod
+    def _needs_git_cli(repo) -> bool:
+        """Check for commit signing or hooks, which libgit2 does not run."""
+        for key in ("commit.gpgsign", "tag.gpgsign"):
+            try:
+                if repo.config.get_bool(key):
+                    return True
+            except KeyError:
+                pass
+        
+        try:
+            hooks_dir = Path(repo.workdir) / repo.config["core.hooksPath"]
+        except KeyError:
+            hooks_dir = Path(repo.path) / "hooks"
+        return any(
+            os.access(hooks_dir / hook, os.X_OK)
+            for hook in ("pre-commit", "prepare-commit-msg", "commit-msg", "post-commit")
+        )
+    
+    def _commit_and_tag(self, version: str) -> bool:
+        """
+        Commit all changes and tag the release with libgit2.
+        
+        Returns False without touching the repository when signing or commit
+        hooks are configured, so the caller can use the git CLI instead.
+        """
+        repo = pygit2.Repository(str(self.project_root))
+        if self._needs_git_cli(repo):
+            return False
+        
+        index = repo.index
+        index.add_all()
+        index.write()
+        tree = index.write_tree()
+        
+        # Like git commit, don't record an empty commit; the tag then goes
+        # on the current HEAD
+        if not repo.head_is_unborn and repo.head.peel().tree.id == tree:
+            commit_id = repo.head.target
+        else:
+            signature = repo.default_signature
+            parents = [] if repo.head_is_unborn else [repo.head.target]
+            commit_id = repo.create_commit(
+                "HEAD", signature, signature, f"chore: release v{version}", tree, parents
+            )
+        repo.references.create(f"refs/tags/v{version}", commit_id)
+        return True
+    
     def create_git_tag(self, version: str):
         """Create and push git tag."""
         print(f"🏷️ Creating git tag v{version}...")
         
-        subprocess.run(["git", "add", "."], cwd=self.project_root)
-        subprocess.run(
-            ["git", "commit", "-m", f"chore: release v{version}"],
-            cwd=self.project_root
-        )
-        subprocess.run(
-            ["git", "tag", f"v{version}"],
-            cwd=self.project_root
-        )
-        subprocess.run(
-            ["git", "push", "origin", "main"],
-            cwd=self.project_root
-        )
+        committed = False
+        if pygit2 is not None:
+            try:
+                committed = self._commit_and_tag(version)
+            except pygit2.GitError as e:
+                print(f"⚠️  pygit2 failed ({e}), falling back to git")
+        
+        if not committed:
+            subprocess.run(["git", "add", "."], cwd=self.project_root)
+            subprocess.run(
+                ["git", "commit", "-m", f"chore: release v{version}"],
+                cwd=self.project_root
+            )
+            subprocess.run(
+                ["git", "tag", f"v{version}"],
+                cwd=self.project_root
+            )
+        
+        # Push the branch and the tag together; git handles the credentials
         subprocess.run(
-            ["git", "push", "origin", f"v{version}"],
+            ["git", "push", "origin", "main", f"v{version}"],
             cwd=self.project_root
         )
         
         print(f"✅ Git tag v{version} created and pushed")
     
+    def changes_since_last_tag(self) -> str:
+        """List commit subjects since the most recent tag as changelog bullets."""
+        last_tag = subprocess.run(
+            ["git", "describe", "--tags", "--abbrev=0"],
+            cwd=self.project_root,
+            capture_output=True,
+            text=True
+        )
+        cmd = ["git", "log", "--no-merges", "--format=- %s"]
+        if last_tag.returncode == 0:
+            cmd.append(f"{last_tag.stdout.strip()}..HEAD")
+        
+        result = subprocess.run(cmd, cwd=self.project_root, capture_output=True, text=True)
+        return result.stdout.rstrip()
+    
     def create_github_release(self, version: str, changes: str) -> bool:
         """Create GitHub release."""
         print(f"🐙 Creating GitHub release for v{version}...")
@@ -239,32 +459,51 @@ class ReleaseManager:
 
 def main():
     """Main release function."""
+    usage = ("Usage: python scripts/release.py <major|minor|patch> [--test] [--force] "
+             "[--changelog FILE | --changelog-from-tag]")
     if len(sys.argv) < 2:
-        print("Usage: python scripts/release.py <major|minor|patch> [--test]")
+        print(usage)
         sys.exit(1)
     
     version_type = sys.argv[1]
     test_mode = "--test" in sys.argv
+    force = "--force" in sys.argv
+    
+    changelog_file = None
+    if "--changelog" in sys.argv:
+        index = sys.argv.index("--changelog") + 1
+        if index >= len(sys.argv):
+            print(usage)
+            sys.exit(1)
+        changelog_file = sys.argv[index]
     
     if version_type not in ['major', 'minor', 'patch']:
         print("Version type must be: major, minor, or patch")
         sys.exit(1)
     
     project_root = Path(__file__).parent.parent
-    release_manager = ReleaseManager(project_root)
+    release_manager = ReleaseManager(project_root, force=force)
     
     print(f"🚀 Starting {'test ' if test_mode else ''}release process...")
     
     # Get changelog input
-    print("\nEnter changelog for this release (end with empty line):")
-    changes_lines = []
-    while True:
-        line = input()
-        if not line:
-            break
-        changes_lines.append(line)
-    
-    changes = '\n'.join(changes_lines)
+    if changelog_file:
+        changes = Path(changelog_file).read_text().rstrip()
+    elif "--changelog-from-tag" in sys.argv:
+        changes = release_manager.changes_since_last_tag()
+    elif not sys.stdin.isatty():
+        # Piped changelog: read it in one go, no empty-line terminator needed
+        changes = sys.stdin.read().rstrip()
+    else:
+        print("\nEnter changelog for this release (end with empty line):")
+        changes_lines = []
+        while True:
+            line = input()
+            if not line:
+                break
+            changes_lines.append(line)
+        
+        changes = '\n'.join(changes_lines)
     
     # Run pre-release checks
     if not release_manager.run_tests():
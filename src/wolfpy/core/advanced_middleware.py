@@ -247,7 +247,8 @@ class ResponseCompressionMiddleware(AdvancedMiddlewareBase):
         
         try:
             # Check if compression is appropriate
-            if (hasattr(response, 'body') and 
+            if (hasattr(response, 'body') and
+                'Content-Encoding' not in response.headers and
                 len(response.body) > self.compression_threshold and
                 'gzip' in request.headers.get('Accept-Encoding', '')):
                 
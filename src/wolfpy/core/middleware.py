@@ -1190,6 +1190,10 @@ class CompressionMiddleware(BaseMiddleware):
         if 'gzip' not in accept_encoding:
             return None
 
+        # Skip responses that are already encoded (e.g. precompressed bodies)
+        if 'Content-Encoding' in response.headers:
+            return None
+
         # Check response size
         if len(response.body) < self.min_size:
             return None
@@ -1471,6 +1475,10 @@ class ResponseCompressionMiddleware(BaseMiddleware):
         if 'gzip' not in accept_encoding.lower():
             return response
 
+        # Skip responses that are already encoded (e.g. precompressed bodies)
+        if 'Content-Encoding' in response.headers:
+            return response
+
         # Check content type
         content_type = response.headers.get('Content-Type', '').split(';')[0]
         if content_type not in self.compressible_types:
@@ -280,6 +280,120 @@ class TestResponseHandling:
         assert 'Set-Cookie' in response.headers
 
 
+class TestCompressionMiddleware:
+    """Test that compression middleware leaves encoded responses alone."""
+    
+    def setup_method(self):
+        """Create a gzip-accepting request and a compressible body."""
+        self.request = Request({
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': '/page',
+            'HTTP_ACCEPT_ENCODING': 'gzip, deflate',
+            'wsgi.input': MagicMock()
+        })
+        self.body = '<p>WolfPy</p>' * 200
+    
+    def test_compresses_plain_response(self):
+        """Test that a large HTML response gets gzipped."""
+        import gzip
+        from src.wolfpy.core.middleware import CompressionMiddleware
+        
+        response = Response(self.body)
+        CompressionMiddleware().process_response(self.request, response)
+        
+        assert response.headers.get('Content-Encoding') == 'gzip'
+        assert gzip.decompress(response.body).decode('utf-8') == self.body
+    
+    def test_skips_precompressed_response(self):
+        """Test that a response with Content-Encoding is not gzipped again."""
+        import gzip
+        from src.wolfpy.core.middleware import (
+            CompressionMiddleware, ResponseCompressionMiddleware
+        )
+        from src.wolfpy.core.advanced_middleware import (
+            MiddlewareExecutionContext,
+            ResponseCompressionMiddleware as AdvancedResponseCompressionMiddleware
+        )
+        
+        compressed = gzip.compress(self.body.encode('utf-8'))
+        
+        response = Response(compressed, headers={'Content-Encoding': 'gzip'})
+        CompressionMiddleware().process_response(self.request, response)
+        assert response.body == compressed
+        
+        response = Response(compressed, headers={'Content-Encoding': 'gzip'})
+        ResponseCompressionMiddleware().process_response(self.request, response)
+        assert response.body == compressed
+        
+        response = Response(compressed, headers={'Content-Encoding': 'gzip'})
+        context = MiddlewareExecutionContext(request_id='test', start_time=0.0)
+        AdvancedResponseCompressionMiddleware().process_response(
+            self.request, response, context
+        )
+        assert response.body == compressed
+        assert response.headers.get('Content-Encoding') == 'gzip'
+
+
+class TestExamplePluginPages:
+    """Test conditional and gzip handling of the example plugin's pages."""
+    
+    def setup_method(self):
+        """Load the example plugin's page helper and home page data."""
+        from plugins import example
+        self.example = example
+        self.etag = example._HOME_ETAG
+    
+    def _get(self, **headers):
+        """Fetch the home page with the given request headers."""
+        environ = {
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': '/example',
+            'wsgi.input': MagicMock()
+        }
+        for name, value in headers.items():
+            environ['HTTP_' + name.upper()] = value
+        return self.example._html_response(
+            Request(environ), self.example._HOME_BODY,
+            self.example._HOME_GZ, self.etag
+        )
+    
+    def test_identity_response(self):
+        """Test that clients without gzip get the plain page."""
+        response = self._get()
+
+        assert response.status == 200
+        assert response.body == self.example._HOME_BODY
+        assert 'Content-Encoding' not in response.headers
+        assert response.headers.get('ETag') == f'"{self.etag}"'
+        assert response.headers.get('Vary') == 'Accept-Encoding'
+    
+    def test_gzip_response(self):
+        """Test that gzip clients get the compressed page with its own ETag."""
+        import gzip
+        response = self._get(accept_encoding='gzip, br')
+
+        assert response.status == 200
+        assert response.headers.get('Content-Encoding') == 'gzip'
+        assert response.headers.get('ETag') == f'"{self.etag}-gz"'
+        assert gzip.decompress(response.body) == self.example._HOME_BODY
+    
+    def test_if_none_match(self):
+        """Test 304 responses for matching validators of the served variant."""
+        assert self._get(if_none_match=f'"{self.etag}"').status == 304
+        assert self._get(if_none_match=f'W/"{self.etag}"').status == 304
+        assert self._get(if_none_match=f'"other", "{self.etag}"').status == 304
+        assert self._get(if_none_match='*').status == 304
+        assert self._get(accept_encoding='gzip',
+                         if_none_match=f'"{self.etag}-gz"').status == 304
+    
+    def test_if_none_match_other_variant(self):
+        """Test that one variant's ETag does not validate the other."""
+        assert self._get(accept_encoding='gzip',
+                         if_none_match=f'"{self.etag}"').status == 200
+        assert self._get(if_none_match=f'"{self.etag}-gz"').status == 200
+        assert self._get(if_none_match='"other"').status == 200
+
+
 class RouteMatch:
     """Simple route match object for testing."""
     def __init__(self, handler, params):